@@ -2,16 +2,168 @@
 Database management for Restaurant Dummy
 """
 
+import logging
 import sqlite3
 import os
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import chain
 from utils import log_message
 
 
+# Store dates and times as ISO text; generated data is passed pre-formatted,
+# these cover callers that hand over native objects
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(time, time.isoformat)
+
+# Batches larger than this are written with multi-row INSERT statements
+_MULTIROW_INSERT_THRESHOLD = 1000
+# Bound parameters allowed per statement (raised from 999 in SQLite 3.32)
+_SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+_POS_SALE_COLUMNS = ('sale_date', 'sale_time', 'item_name', 'item_category',
+                     'quantity', 'unit_price', 'total_amount', 'employee_id')
+_ROSTER_COLUMNS = ('employee_id', 'employee_name', 'shift_date', 'start_time', 'end_time',
+                   'worked_hours', 'hourly_rate', 'total_cost', 'position')
+
+# Statement text is built once so every call hands sqlite3 the identical
+# string and hits the connection's prepared-statement cache
+_INSERT_POS_SALE_SQL = (
+    f"INSERT INTO pos_sales ({', '.join(_POS_SALE_COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * len(_POS_SALE_COLUMNS))})"
+)
+_INSERT_ROSTER_SQL = (
+    f"INSERT INTO roster_data ({', '.join(_ROSTER_COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * len(_ROSTER_COLUMNS))})"
+)
+_UPSERT_EMPLOYEE_SQL = """
+    INSERT INTO employees (employee_id, name, position, hourly_rate, active)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (employee_id) DO UPDATE SET
+        name = excluded.name,
+        position = excluded.position,
+        hourly_rate = excluded.hourly_rate,
+        active = excluded.active
+"""
+
+
+def _pos_sale_row(sale_data):
+    """Build the pos_sales parameter tuple for a sale record"""
+    return (
+        sale_data['sale_date'],
+        sale_data['sale_time'],
+        sale_data['item_name'],
+        sale_data.get('item_category'),
+        sale_data['quantity'],
+        sale_data['unit_price'],
+        sale_data['total_amount'],
+        sale_data.get('employee_id')
+    )
+
+
+def _roster_row(roster_data):
+    """Build the roster_data parameter tuple for a roster record"""
+    return (
+        roster_data['employee_id'],
+        roster_data['employee_name'],
+        roster_data['shift_date'],
+        roster_data['start_time'],
+        roster_data['end_time'],
+        roster_data['worked_hours'],
+        roster_data.get('hourly_rate'),
+        roster_data.get('total_cost'),
+        roster_data.get('position')
+    )
+
+
+def _employee_row(employee_data):
+    """Build the employees parameter tuple for an employee record"""
+    return (
+        employee_data['employee_id'],
+        employee_data['name'],
+        employee_data.get('position'),
+        employee_data.get('hourly_rate'),
+        int(bool(employee_data.get('active', True)))
+    )
+
+
+# Aggregates behind get_sales_summary and get_roster_summary; get_combined_summary
+# runs both in one statement and splits the row at _SALES_SUMMARY_WIDTH
+_SALES_SUMMARY_SQL = """
+    SELECT 
+        COUNT(*) as total_transactions,
+        SUM(total_amount) as total_revenue,
+        AVG(total_amount) as avg_transaction,
+        COUNT(DISTINCT sale_date) as active_days,
+        COUNT(DISTINCT employee_id) as active_employees
+    FROM pos_sales 
+    WHERE sale_date BETWEEN :start AND :end
+"""
+
+_ROSTER_SUMMARY_SQL = """
+    SELECT 
+        COUNT(*) as total_shifts,
+        SUM(worked_hours) as total_hours,
+        AVG(worked_hours) as avg_hours_per_shift,
+        SUM(total_cost) as total_labor_cost,
+        COUNT(DISTINCT employee_id) as active_employees
+    FROM roster_data 
+    WHERE shift_date BETWEEN :start AND :end
+"""
+
+_COMBINED_SUMMARY_SQL = (
+    f"SELECT * FROM ({_SALES_SUMMARY_SQL}) AS s, ({_ROSTER_SUMMARY_SQL}) AS r"
+)
+
+_SALES_SUMMARY_WIDTH = 5
+
+
+def _sales_summary(start_date, end_date, values):
+    """Build the sales summary dict from the _SALES_SUMMARY_SQL columns"""
+    total_transactions, total_revenue, avg_transaction, active_days, active_employees = values
+    return {
+        'period_start': start_date.isoformat(),
+        'period_end': end_date.isoformat(),
+        'total_transactions': total_transactions or 0,
+        'total_revenue': float(total_revenue or 0),
+        'avg_transaction': float(avg_transaction or 0),
+        'active_days': active_days or 0,
+        'active_employees': active_employees or 0
+    }
+
+
+def _roster_summary(start_date, end_date, values):
+    """Build the roster summary dict from the _ROSTER_SUMMARY_SQL columns"""
+    total_shifts, total_hours, avg_hours_per_shift, total_labor_cost, active_employees = values
+    return {
+        'period_start': start_date.isoformat(),
+        'period_end': end_date.isoformat(),
+        'total_shifts': total_shifts or 0,
+        'total_hours': float(total_hours or 0),
+        'avg_hours_per_shift': float(avg_hours_per_shift or 0),
+        'total_labor_cost': float(total_labor_cost or 0),
+        'active_employees': active_employees or 0
+    }
+
+
+@lru_cache(maxsize=None)
+def _multirow_insert_sql(table, columns, num_rows):
+    """Build an INSERT statement with num_rows VALUES groups"""
+    row_placeholders = "(" + ", ".join(["?"] * len(columns)) + ")"
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+            + ", ".join([row_placeholders] * num_rows))
+
+
 class Database:
     def __init__(self, config):
         self.db_path = config['path']
+        self._local = threading.local()
+        # Thread -> connection, so connections of finished threads can be closed
+        self._connections = {}
+        self._connections_lock = threading.Lock()
         self.ensure_db_directory()
+        self.enable_wal()
     
     def ensure_db_directory(self):
         """Ensure the database directory exists"""
@@ -19,17 +171,67 @@ class Database:
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
     
+    def enable_wal(self):
+        """Switch the database file to WAL journal mode (persists in the file)"""
+        if ':memory:' in self.db_path:
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+    
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's database connection, opening it on first use
+        
+        The connection is kept open for reuse; ``with conn:`` still scopes a
+        transaction (commit or rollback) without closing it.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        # Connections stay with their thread; close() and the pruning below are
+        # the only cross-thread use, which needs the same-thread check relaxed
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if ':memory:' not in self.db_path:
+            # Per-connection settings; journal_mode is set once in enable_wal
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA busy_timeout=5000")
+        
+        self._local.conn = conn
+        with self._connections_lock:
+            finished = [thread for thread in self._connections if not thread.is_alive()]
+            stale = [self._connections.pop(thread) for thread in finished]
+            self._connections[threading.current_thread()] = conn
+        self._close_all(stale)
+        return conn
+    
+    def close(self):
+        """Close all connections opened by this Database"""
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections = {}
+        self._local = threading.local()
+        self._close_all(connections)
+    
+    def _close_all(self, connections):
+        """Close each connection, logging failures without stopping"""
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                log_message(f"Error closing database connection: {e}", logging.ERROR)
     
     def setup_tables(self):
         """Create database tables"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # POS Sales table
-            cursor.execute("""
+            conn.executescript("""
+                -- POS Sales table
                 CREATE TABLE IF NOT EXISTS pos_sales (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     sale_date DATE NOT NULL,
@@ -41,11 +243,9 @@ class Database:
                     total_amount DECIMAL(10,2) NOT NULL,
                     employee_id TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Roster/Timesheet table
-            cursor.execute("""
+                );
+                
+                -- Roster/Timesheet table
                 CREATE TABLE IF NOT EXISTS roster_data (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     employee_id TEXT NOT NULL,
@@ -58,11 +258,9 @@ class Database:
                     total_cost DECIMAL(10,2),
                     position TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Employee master data
-            cursor.execute("""
+                );
+                
+                -- Employee master data
                 CREATE TABLE IF NOT EXISTS employees (
                     employee_id TEXT PRIMARY KEY,
                     name TEXT NOT NULL,
@@ -70,142 +268,179 @@ class Database:
                     hourly_rate DECIMAL(8,2),
                     active BOOLEAN DEFAULT 1,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                );
+                
+                -- Covering indexes for the date-filtered summary queries; the
+                -- leading date column also serves the per-day lookups
+                CREATE INDEX IF NOT EXISTS idx_pos_sales_date_emp
+                ON pos_sales (sale_date, employee_id, total_amount);
+                
+                CREATE INDEX IF NOT EXISTS idx_roster_date_emp
+                ON roster_data (shift_date, employee_id, worked_hours, total_cost);
+                
+                ANALYZE;
             """)
-            
-            conn.commit()
             log_message("Database tables created successfully")
     
     def insert_pos_sale(self, sale_data):
         """Insert a POS sale record"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO pos_sales (sale_date, sale_time, item_name, item_category, 
-                                     quantity, unit_price, total_amount, employee_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                sale_data['sale_date'],
-                sale_data['sale_time'],
-                sale_data['item_name'],
-                sale_data.get('item_category'),
-                sale_data['quantity'],
-                sale_data['unit_price'],
-                sale_data['total_amount'],
-                sale_data.get('employee_id')
-            ))
-            conn.commit()
+            cursor = conn.execute(_INSERT_POS_SALE_SQL, _pos_sale_row(sale_data))
             return cursor.lastrowid
     
+    def insert_pos_sales_bulk(self, sales):
+        """Insert many POS sale records in a single transaction"""
+        rows = [_pos_sale_row(sale_data) for sale_data in sales]
+        
+        with self.get_connection() as conn:
+            if len(rows) > _MULTIROW_INSERT_THRESHOLD:
+                self._chunked_multirow_insert(conn, 'pos_sales', _POS_SALE_COLUMNS, rows)
+            else:
+                conn.executemany(_INSERT_POS_SALE_SQL, rows)
+            return len(rows)
+    
     def insert_roster_record(self, roster_data):
         """Insert a roster record"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO roster_data (employee_id, employee_name, shift_date, 
-                                       start_time, end_time, worked_hours, hourly_rate, 
-                                       total_cost, position)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                roster_data['employee_id'],
-                roster_data['employee_name'],
-                roster_data['shift_date'],
-                roster_data['start_time'],
-                roster_data['end_time'],
-                roster_data['worked_hours'],
-                roster_data.get('hourly_rate'),
-                roster_data.get('total_cost'),
-                roster_data.get('position')
-            ))
-            conn.commit()
+            cursor = conn.execute(_INSERT_ROSTER_SQL, _roster_row(roster_data))
             return cursor.lastrowid
     
+    def insert_roster_records_bulk(self, records):
+        """Insert many roster records in a single transaction"""
+        rows = [_roster_row(roster_data) for roster_data in records]
+        
+        with self.get_connection() as conn:
+            if len(rows) > _MULTIROW_INSERT_THRESHOLD:
+                self._chunked_multirow_insert(conn, 'roster_data', _ROSTER_COLUMNS, rows)
+            else:
+                conn.executemany(_INSERT_ROSTER_SQL, rows)
+            return len(rows)
+    
+    def _chunked_multirow_insert(self, conn, table, columns, rows):
+        """Insert rows using multi-row VALUES statements, several rows per statement"""
+        rows_per_stmt = min(500, _SQLITE_MAX_VARIABLES // len(columns))
+        
+        for start in range(0, len(rows), rows_per_stmt):
+            chunk = rows[start:start + rows_per_stmt]
+            conn.execute(_multirow_insert_sql(table, columns, len(chunk)),
+                         list(chain.from_iterable(chunk)))
+    
     def insert_employee(self, employee_data):
         """Insert or update employee record"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO employees (employee_id, name, position, hourly_rate, active)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                employee_data['employee_id'],
-                employee_data['name'],
-                employee_data.get('position'),
-                employee_data.get('hourly_rate'),
-                employee_data.get('active', True)
-            ))
-            conn.commit()
+            conn.execute(_UPSERT_EMPLOYEE_SQL, _employee_row(employee_data))
+    
+    def insert_employees_bulk(self, employees):
+        """Insert or update many employee records in a single transaction"""
+        rows = [_employee_row(employee_data) for employee_data in employees]
+        
+        with self.get_connection() as conn:
+            conn.executemany(_UPSERT_EMPLOYEE_SQL, rows)
+            return len(rows)
     
     def get_sales_summary(self, days=7):
         """Get sales summary for the last N days"""
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days-1)
         
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SALES_SUMMARY_SQL, {'start': start_date, 'end': end_date})
+            return _sales_summary(start_date, end_date, cursor.fetchone())
+    
+    def get_roster_summary(self, days=7):
+        """Get roster summary for the last N days"""
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days-1)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_ROSTER_SUMMARY_SQL, {'start': start_date, 'end': end_date})
+            return _roster_summary(start_date, end_date, cursor.fetchone())
+    
+    def get_combined_summary(self, days=7):
+        """Get sales and roster summaries for the last N days in one query"""
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days-1)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_COMBINED_SUMMARY_SQL, {'start': start_date, 'end': end_date})
+            
+            result = tuple(cursor.fetchone())
+            return {
+                'sales_summary': _sales_summary(start_date, end_date,
+                                                result[:_SALES_SUMMARY_WIDTH]),
+                'roster_summary': _roster_summary(start_date, end_date,
+                                                  result[_SALES_SUMMARY_WIDTH:])
+            }
+    
+    def get_daily_sales(self, date):
+        """Get sales for a specific date"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM pos_sales 
+                WHERE sale_date = ?
+                ORDER BY sale_time
+            """, (date,))
+            
+            return [dict(row) for row in cursor]
+    
+    def get_pos_daily_totals(self, date):
+        """Get transaction count, revenue and items sold for a specific date"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT 
                     COUNT(*) as total_transactions,
                     SUM(total_amount) as total_revenue,
-                    AVG(total_amount) as avg_transaction,
-                    COUNT(DISTINCT sale_date) as active_days,
-                    COUNT(DISTINCT employee_id) as active_employees
+                    SUM(quantity) as items_sold
                 FROM pos_sales 
-                WHERE sale_date BETWEEN ? AND ?
-            """, (start_date, end_date))
+                WHERE sale_date = ?
+            """, (date,))
             
             result = cursor.fetchone()
             return {
-                'period_start': start_date.isoformat(),
-                'period_end': end_date.isoformat(),
                 'total_transactions': result[0] or 0,
                 'total_revenue': float(result[1] or 0),
-                'avg_transaction': float(result[2] or 0),
-                'active_days': result[3] or 0,
-                'active_employees': result[4] or 0
+                'items_sold': result[2] or 0
             }
     
-    def get_roster_summary(self, days=7):
-        """Get roster summary for the last N days"""
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=days-1)
-        
+    def get_pos_top_items(self, date, limit=5):
+        """Get the best selling items by quantity for a specific date"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_shifts,
-                    SUM(worked_hours) as total_hours,
-                    AVG(worked_hours) as avg_hours_per_shift,
-                    SUM(total_cost) as total_labor_cost,
-                    COUNT(DISTINCT employee_id) as active_employees
-                FROM roster_data 
-                WHERE shift_date BETWEEN ? AND ?
-            """, (start_date, end_date))
+                SELECT item_name, SUM(quantity) as quantity
+                FROM pos_sales 
+                WHERE sale_date = ?
+                GROUP BY item_name
+                ORDER BY quantity DESC, item_name
+                LIMIT ?
+            """, (date, limit))
             
-            result = cursor.fetchone()
-            return {
-                'period_start': start_date.isoformat(),
-                'period_end': end_date.isoformat(),
-                'total_shifts': result[0] or 0,
-                'total_hours': float(result[1] or 0),
-                'avg_hours_per_shift': float(result[2] or 0),
-                'total_labor_cost': float(result[3] or 0),
-                'active_employees': result[4] or 0
-            }
+            return [tuple(row) for row in cursor]
     
-    def get_daily_sales(self, date):
-        """Get sales for a specific date"""
+    def get_pos_hourly_breakdown(self, date):
+        """Get transaction count and revenue per hour for a specific date"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM pos_sales 
+                SELECT 
+                    CAST(substr(sale_time, 1, 2) AS INTEGER) as hour,
+                    COUNT(*) as transactions,
+                    SUM(total_amount) as revenue
+                FROM pos_sales 
                 WHERE sale_date = ?
-                ORDER BY sale_time
+                GROUP BY hour
+                ORDER BY hour
             """, (date,))
             
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return {
+                hour: {'transactions': transactions, 'revenue': revenue}
+                for hour, transactions, revenue in cursor.fetchall()
+            }
     
     def get_daily_roster(self, date):
         """Get roster for a specific date"""
@@ -217,5 +452,4 @@ class Database:
                 ORDER BY start_time
             """, (date,))
             
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
\ No newline at end of file
+            return [dict(row) for row in cursor]
\ No newline at end of file
@@ -4,7 +4,9 @@ Main application entry point for Restaurant Dummy
 """
 
 import argparse
+import functools
 import json
+import logging
 import os
 from datetime import datetime, timedelta
 from database import Database
@@ -13,6 +15,7 @@ from roster_data import RosterManager
 from utils import setup_logging, log_message
 
 
+@functools.lru_cache(maxsize=1)
 def load_config():
     """Load configuration from JSON file"""
     config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'restaurant_config.json')
@@ -54,7 +57,7 @@ def main():
         log_message("✅ Operation completed successfully")
         
     except Exception as e:
-        log_message(f"❌ Error: {e}")
+        log_message(f"❌ Error: {e}", logging.ERROR)
         return 1
     
     return 0
@@ -74,12 +77,15 @@ def process_pos_data(db, config, args):
     
     if args.date:
         target_date = datetime.strptime(args.date, '%Y-%m-%d').date()
-        pos_manager.process_date(target_date)
+        inserted = pos_manager.process_date(target_date)
+        log_message(f"Inserted {inserted} POS transactions for {target_date}")
     else:
         # Process last N days
+        today = datetime.now().date()
+        inserted = 0
         for i in range(args.days):
-            target_date = datetime.now().date() - timedelta(days=i)
-            pos_manager.process_date(target_date)
+            inserted += pos_manager.process_date(today - timedelta(days=i))
+        log_message(f"Inserted {inserted} POS transactions over {args.days} days")
 
 
 def process_roster_data(db, config, args):
@@ -89,28 +95,30 @@ def process_roster_data(db, config, args):
     
     if args.date:
         target_date = datetime.strptime(args.date, '%Y-%m-%d').date()
-        roster_manager.process_date(target_date)
+        inserted = roster_manager.process_date(target_date)
+        log_message(f"Inserted {inserted} roster shifts for {target_date}")
     else:
         # Process last N days
+        today = datetime.now().date()
+        inserted = 0
         for i in range(args.days):
-            target_date = datetime.now().date() - timedelta(days=i)
-            roster_manager.process_date(target_date)
+            inserted += roster_manager.process_date(today - timedelta(days=i))
+        log_message(f"Inserted {inserted} roster shifts over {args.days} days")
 
 
 def generate_report(db, config, args):
     """Generate reports"""
     log_message("Generating reports...")
     
-    # Simple sales report
-    sales_data = db.get_sales_summary(args.days)
-    roster_data = db.get_roster_summary(args.days)
+    # Simple sales and roster report, fetched in one query
+    summary = db.get_combined_summary(args.days)
     
     report = {
         'generated_at': datetime.now().isoformat(),
         'restaurant': config['restaurant']['name'],
         'period_days': args.days,
-        'sales_summary': sales_data,
-        'roster_summary': roster_data
+        'sales_summary': summary['sales_summary'],
+        'roster_summary': summary['roster_summary']
     }
     
     if args.output:
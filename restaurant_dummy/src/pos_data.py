@@ -2,8 +2,8 @@
 POS (Point of Sale) data management
 """
 
+import logging
 import random
-from datetime import datetime, timedelta, time
 from utils import log_message
 
 
@@ -11,7 +11,9 @@ class POSManager:
     def __init__(self, db, config):
         self.db = db
         self.config = config
+        self.verbose = config.get('settings', {}).get('verbose', False)
         self.menu_items = self._load_menu_items()
+        self._employee_ids = [f"EMP{i:03d}" for i in range(1, 9)]  # 8 employees
     
     def _load_menu_items(self):
         """Sample menu items for demonstration"""
@@ -34,7 +36,8 @@ class POSManager:
     
     def process_date(self, target_date):
         """Generate sample POS data for a specific date"""
-        log_message(f"Processing POS data for {target_date}")
+        if self.verbose:
+            log_message(f"Processing POS data for {target_date}")
         
         # Generate realistic number of transactions
         if target_date.weekday() < 5:  # Weekday
@@ -44,53 +47,49 @@ class POSManager:
         
         transactions_inserted = 0
         
-        for _ in range(num_transactions):
-            try:
-                transaction = self._generate_transaction(target_date)
-                sale_id = self.db.insert_pos_sale(transaction)
-                if sale_id:
-                    transactions_inserted += 1
-            except Exception as e:
-                log_message(f"Error inserting transaction: {e}")
+        transactions = self._generate_batch(target_date, num_transactions)
+        try:
+            transactions_inserted = self.db.insert_pos_sales_bulk(transactions)
+        except Exception as e:
+            log_message(f"Error inserting transactions: {e}", logging.ERROR)
         
-        log_message(f"Inserted {transactions_inserted} POS transactions for {target_date}")
+        if self.verbose:
+            log_message(f"Inserted {transactions_inserted} POS transactions for {target_date}")
         return transactions_inserted
     
-    def _generate_transaction(self, sale_date):
-        """Generate a realistic POS transaction"""
-        # Random time during business hours (9 AM to 11 PM)
-        hour = random.randint(9, 22)
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
-        sale_time = time(hour, minute, second)
-        
-        # Random menu item
-        item = random.choice(self.menu_items)
-        quantity = random.choices([1, 2, 3], weights=[80, 15, 5])[0]  # Most orders are single items
-        
-        # Random employee (using simple IDs)
-        employee_id = f"EMP{random.randint(1, 8):03d}"  # 8 employees
-        
-        # Calculate totals
-        unit_price = item['price']
-        total_amount = unit_price * quantity
-        
-        return {
-            'sale_date': sale_date,
-            'sale_time': sale_time,
-            'item_name': item['name'],
-            'item_category': item['category'],
-            'quantity': quantity,
-            'unit_price': unit_price,
-            'total_amount': total_amount,
-            'employee_id': employee_id
-        }
+    def _generate_batch(self, sale_date, count):
+        """Generate a batch of realistic POS transactions, drawing each field once for the batch"""
+        # Random times during business hours (9 AM to 11 PM)
+        hours = random.choices(range(9, 23), k=count)
+        minutes = random.choices(range(60), k=count)
+        seconds = random.choices(range(60), k=count)
+        
+        items = random.choices(self.menu_items, k=count)
+        quantities = random.choices([1, 2, 3], weights=[80, 15, 5], k=count)
+        employee_ids = random.choices(self._employee_ids, k=count)
+        
+        # Dates and times are bound as ISO text, formatted here once
+        sale_date = sale_date.isoformat()
+        return [
+            {
+                'sale_date': sale_date,
+                'sale_time': f"{hour:02d}:{minute:02d}:{second:02d}",
+                'item_name': item['name'],
+                'item_category': item['category'],
+                'quantity': quantity,
+                'unit_price': item['price'],
+                'total_amount': item['price'] * quantity,
+                'employee_id': employee_id
+            }
+            for hour, minute, second, item, quantity, employee_id
+            in zip(hours, minutes, seconds, items, quantities, employee_ids)
+        ]
     
     def get_daily_summary(self, date):
         """Get summary of POS sales for a specific date"""
-        sales = self.db.get_daily_sales(date)
+        totals = self.db.get_pos_daily_totals(date)
         
-        if not sales:
+        if not totals['total_transactions']:
             return {
                 'date': date.isoformat(),
                 'total_transactions': 0,
@@ -100,32 +99,18 @@ class POSManager:
                 'hourly_breakdown': {}
             }
         
-        total_transactions = len(sales)
-        total_revenue = sum(sale['total_amount'] for sale in sales)
-        items_sold = sum(sale['quantity'] for sale in sales)
-        
-        # Top selling items
-        item_counts = {}
-        for sale in sales:
-            item_name = sale['item_name']
-            item_counts[item_name] = item_counts.get(item_name, 0) + sale['quantity']
+        total_transactions = totals['total_transactions']
+        total_revenue = totals['total_revenue']
         
-        top_items = sorted(item_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Hourly breakdown
-        hourly_breakdown = {}
-        for sale in sales:
-            hour = datetime.strptime(sale['sale_time'], '%H:%M:%S').hour
-            if hour not in hourly_breakdown:
-                hourly_breakdown[hour] = {'transactions': 0, 'revenue': 0}
-            hourly_breakdown[hour]['transactions'] += 1
-            hourly_breakdown[hour]['revenue'] += sale['total_amount']
+        # Top selling items and hourly breakdown are aggregated in SQL
+        top_items = self.db.get_pos_top_items(date, limit=5)
+        hourly_breakdown = self.db.get_pos_hourly_breakdown(date)
         
         return {
             'date': date.isoformat(),
             'total_transactions': total_transactions,
             'total_revenue': float(total_revenue),
-            'items_sold': items_sold,
+            'items_sold': totals['items_sold'],
             'avg_transaction': float(total_revenue / total_transactions) if total_transactions > 0 else 0,
             'top_items': [{'item': item, 'quantity': qty} for item, qty in top_items],
             'hourly_breakdown': {str(hour): data for hour, data in hourly_breakdown.items()}
@@ -134,25 +119,39 @@ class POSManager:
     def import_pos_data(self, data_list):
         """Import POS data from external source"""
         imported_count = 0
+        records = []
         
         for record in data_list:
             try:
                 # Validate required fields
                 required_fields = ['sale_date', 'sale_time', 'item_name', 'quantity', 'unit_price']
                 if not all(field in record for field in required_fields):
-                    log_message(f"Skipping record - missing required fields: {record}")
+                    log_message(f"Skipping record - missing required fields: {record}",
+                                logging.WARNING)
                     continue
                 
                 # Calculate total if not provided
                 if 'total_amount' not in record:
                     record['total_amount'] = record['quantity'] * record['unit_price']
                 
-                sale_id = self.db.insert_pos_sale(record)
-                if sale_id:
-                    imported_count += 1
+                records.append(record)
                 
             except Exception as e:
-                log_message(f"Error importing POS record: {e}")
+                log_message(f"Error importing POS record: {e}", logging.ERROR)
+        
+        if records:
+            try:
+                imported_count = self.db.insert_pos_sales_bulk(records)
+            except Exception as e:
+                # The batch was rolled back; retry row by row so valid records still land
+                log_message(f"Error importing POS records as a batch, retrying individually: {e}",
+                            logging.WARNING)
+                for record in records:
+                    try:
+                        if self.db.insert_pos_sale(record):
+                            imported_count += 1
+                    except Exception as e:
+                        log_message(f"Error importing POS record: {e}", logging.ERROR)
         
         log_message(f"Imported {imported_count} POS records")
         return imported_count
\ No newline at end of file
@@ -2,17 +2,32 @@
 Roster and timesheet data management
 """
 
+import logging
 import random
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time
 from utils import log_message
 
 
+# strptime gives bare times this date, so time objects are anchored to it too
+_TIME_ANCHOR_DATE = date(1900, 1, 1)
+
+
 class RosterManager:
     def __init__(self, db, config):
         self.db = db
         self.config = config
+        self.verbose = config.get('settings', {}).get('verbose', False)
         self.employees = self._load_employees()
         self.positions = self._load_positions()
+        for emp in self.employees:
+            emp['_cfg'] = self.positions[emp['position']]
+        # (employee, is_manager, is_full_time) evaluated once for scheduling
+        self._emp_records = [
+            (emp, emp['position'] == 'Manager', emp['position'] in ('Chef', 'Server'))
+            for emp in self.employees
+        ]
+        # Week start (Monday) -> schedule drawn by generate_week_schedule
+        self._week_schedules = {}
     
     def _load_employees(self):
         """Sample employee data"""
@@ -39,67 +54,85 @@ class RosterManager:
     
     def setup_employees(self):
         """Initialize employee records in database"""
-        for emp in self.employees:
-            self.db.insert_employee({
-                'employee_id': emp['id'],
-                'name': emp['name'],
-                'position': emp['position'],
-                'hourly_rate': emp['hourly_rate'],
-                'active': True
-            })
+        self.db.insert_employees_bulk([{
+            'employee_id': emp['id'],
+            'name': emp['name'],
+            'position': emp['position'],
+            'hourly_rate': emp['hourly_rate'],
+            'active': 1
+        } for emp in self.employees])
         log_message(f"Setup {len(self.employees)} employee records")
     
     def process_date(self, target_date):
         """Generate sample roster data for a specific date"""
-        log_message(f"Processing roster data for {target_date}")
+        if self.verbose:
+            log_message(f"Processing roster data for {target_date}")
         
         shifts_inserted = 0
         
         # Determine which employees work on this date
         working_employees = self._get_working_employees(target_date)
         
+        shifts = []
         for emp in working_employees:
             try:
                 shift = self._generate_shift(emp, target_date)
                 if shift:
-                    shift_id = self.db.insert_roster_record(shift)
-                    if shift_id:
-                        shifts_inserted += 1
+                    shifts.append(shift)
+            except Exception as e:
+                log_message(f"Error generating shift for {emp['name']}: {e}", logging.ERROR)
+        
+        if shifts:
+            try:
+                shifts_inserted = self.db.insert_roster_records_bulk(shifts)
             except Exception as e:
-                log_message(f"Error inserting shift for {emp['name']}: {e}")
+                log_message(f"Error inserting shifts: {e}", logging.ERROR)
         
-        log_message(f"Inserted {shifts_inserted} roster shifts for {target_date}")
+        if self.verbose:
+            log_message(f"Inserted {shifts_inserted} roster shifts for {target_date}")
         return shifts_inserted
     
+    def generate_week_schedule(self, start_date):
+        """Draw a 7-day schedule starting at start_date
+        
+        Returns one row per employee (in self.employees order) holding a
+        working/not-working flag for each of the seven days.
+        """
+        rand = random.random
+        weekdays = [(start_date + timedelta(days=offset)).weekday() < 5 for offset in range(7)]
+        schedule = []
+        
+        for emp, is_manager, is_full_time in self._emp_records:
+            row = []
+            for is_weekday in weekdays:
+                # Simple scheduling logic - some randomness with position-based probability
+                if is_manager:
+                    # Manager works most days except random days off
+                    row.append(rand() < 0.85)
+                elif is_weekday:
+                    # Higher chance for full-time positions
+                    row.append((is_full_time and rand() < 0.7) or rand() < 0.5)
+                else:  # Weekend
+                    # Different pattern for weekends
+                    row.append(rand() < 0.8)
+            schedule.append(row)
+        
+        return schedule
+    
     def _get_working_employees(self, date):
         """Determine which employees are scheduled to work on a given date"""
-        working = []
+        day = date.weekday()
+        week_start = date - timedelta(days=day)
         
-        for emp in self.employees:
-            position_config = self.positions[emp['position']]
-            shifts_per_week = position_config['shifts_per_week']
-            
-            # Simple scheduling logic - some randomness with position-based probability
-            if emp['position'] == 'Manager':
-                # Manager works most days except random days off
-                if random.random() < 0.85:
-                    working.append(emp)
-            elif date.weekday() < 5:  # Weekday
-                # Higher chance for full-time positions
-                if emp['position'] in ['Chef', 'Server'] and random.random() < 0.7:
-                    working.append(emp)
-                elif random.random() < 0.5:
-                    working.append(emp)
-            else:  # Weekend
-                # Different pattern for weekends
-                if random.random() < 0.8:
-                    working.append(emp)
-        
-        return working
+        schedule = self._week_schedules.get(week_start)
+        if schedule is None:
+            schedule = self._week_schedules[week_start] = self.generate_week_schedule(week_start)
+        
+        return [emp for emp, row in zip(self.employees, schedule) if row[day]]
     
     def _generate_shift(self, employee, shift_date):
         """Generate a realistic shift for an employee"""
-        position_config = self.positions[employee['position']]
+        position_config = employee['_cfg']
         
         # Random shift duration within position limits
         min_hours = position_config['min_hours']
@@ -129,9 +162,9 @@ class RosterManager:
         return {
             'employee_id': employee['id'],
             'employee_name': employee['name'],
-            'shift_date': shift_date,
-            'start_time': start_time,
-            'end_time': end_time,
+            'shift_date': shift_date.isoformat(),
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
             'worked_hours': shift_hours,
             'hourly_rate': hourly_rate,
             'total_cost': total_cost,
@@ -145,14 +178,14 @@ class RosterManager:
             if isinstance(start_time, str):
                 start_dt = datetime.strptime(start_time, '%H:%M:%S')
             elif isinstance(start_time, time):
-                start_dt = datetime.combine(datetime.today(), start_time)
+                start_dt = datetime.combine(_TIME_ANCHOR_DATE, start_time)
             else:
                 start_dt = start_time
             
             if isinstance(end_time, str):
                 end_dt = datetime.strptime(end_time, '%H:%M:%S')
             elif isinstance(end_time, time):
-                end_dt = datetime.combine(datetime.today(), end_time)
+                end_dt = datetime.combine(_TIME_ANCHOR_DATE, end_time)
             else:
                 end_dt = end_time
             
@@ -176,9 +209,24 @@ class RosterManager:
             return round(max(0, total_hours), 2)  # Ensure non-negative
             
         except Exception as e:
-            log_message(f"Error calculating worked hours: {e}")
+            log_message(f"Error calculating worked hours: {e}", logging.ERROR)
             return 0.0
     
+    def calculate_worked_hours_bulk(self, start_minutes, end_minutes, break_minutes=None):
+        """Calculate worked hours for many shifts given as minutes since midnight
+        
+        Follows the same rules as calculate_worked_hours: shifts ending
+        before they start cross midnight, breaks are subtracted, and results
+        are clamped at zero and rounded to two decimals.
+        """
+        if break_minutes is None:
+            break_minutes = [0] * len(start_minutes)
+        
+        return [
+            round(max(0, ((end - start) % 1440 - breaks) / 60), 2)
+            for start, end, breaks in zip(start_minutes, end_minutes, break_minutes)
+        ]
+    
     def get_daily_summary(self, date):
         """Get summary of roster for a specific date"""
         shifts = self.db.get_daily_roster(date)
@@ -222,13 +270,15 @@ class RosterManager:
     def import_roster_data(self, data_list):
         """Import roster data from external source"""
         imported_count = 0
+        records = []
         
         for record in data_list:
             try:
                 # Validate required fields
                 required_fields = ['employee_id', 'employee_name', 'shift_date', 'start_time', 'end_time']
                 if not all(field in record for field in required_fields):
-                    log_message(f"Skipping record - missing required fields: {record}")
+                    log_message(f"Skipping record - missing required fields: {record}",
+                                logging.WARNING)
                     continue
                 
                 # Calculate worked hours if not provided
@@ -243,12 +293,24 @@ class RosterManager:
                 if 'total_cost' not in record and 'hourly_rate' in record:
                     record['total_cost'] = record['worked_hours'] * record['hourly_rate']
                 
-                shift_id = self.db.insert_roster_record(record)
-                if shift_id:
-                    imported_count += 1
+                records.append(record)
                 
             except Exception as e:
-                log_message(f"Error importing roster record: {e}")
+                log_message(f"Error importing roster record: {e}", logging.ERROR)
+        
+        if records:
+            try:
+                imported_count = self.db.insert_roster_records_bulk(records)
+            except Exception as e:
+                # The batch was rolled back; retry row by row so valid records still land
+                log_message(f"Error importing roster records as a batch, retrying individually: {e}",
+                            logging.WARNING)
+                for record in records:
+                    try:
+                        if self.db.insert_roster_record(record):
+                            imported_count += 1
+                    except Exception as e:
+                        log_message(f"Error importing roster record: {e}", logging.ERROR)
         
         log_message(f"Imported {imported_count} roster records")
         return imported_count
\ No newline at end of file
@@ -3,13 +3,54 @@ Utility functions for Restaurant Dummy
 """
 
 import logging
+import math
 import os
-from datetime import datetime, timedelta
+import re
+from datetime import date, datetime, time, timedelta
 import json
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
+
+
+# Precompiled equivalents of the strptime formats accepted by parse_date and
+# parse_time, with the group index of each field. Matching one of these and
+# building the value directly avoids strptime's per-call format handling.
+# [0-9] rather than \d, which would also match non-ASCII digits strptime rejects.
+# Patterns are grouped by separator so each input only tries its own shape.
+_SLASH_DATE_RE = re.compile(r'([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})')
+_DASH_DATE_PATTERNS = (
+    (re.compile(r'([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})'), (0, 1, 2)),  # %Y-%m-%d
+)
+_SLASH_DATE_PATTERNS = (
+    (_SLASH_DATE_RE, (2, 1, 0)),                                        # %d/%m/%Y
+    (_SLASH_DATE_RE, (2, 0, 1)),                                        # %m/%d/%Y
+)
+_COMPACT_DATE_PATTERNS = (
+    (re.compile(r'([0-9]{4})([0-9]{2})([0-9]{2})'), (0, 1, 2)),        # %Y%m%d
+)
+_TIME_24H_RE = re.compile(r'([0-9]{1,2}):([0-9]{1,2})(?::([0-9]{1,2}))?')
+_TIME_12H_RE = re.compile(r'([0-9]{1,2}):([0-9]{1,2})(?::([0-9]{1,2}))?\s+([AaPp][Mm])')
+
+# strptime formats, tried in order when no pattern above matches
+_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y%m%d')
+_TIME_FORMATS = ('%H:%M:%S', '%H:%M', '%I:%M:%S %p', '%I:%M %p')
+
+# Employee IDs are EMP followed by exactly three digits
+_EMPLOYEE_ID_RE = re.compile(r'EMP[0-9]{3}')
+
+
+# Set by setup_logging; lets log_message return early when logging is off
+_LOG_ENABLED = True
+
 
 def setup_logging(enable_logging=True):
     """Setup logging configuration"""
+    global _LOG_ENABLED
+    _LOG_ENABLED = enable_logging
+    
     if enable_logging:
         logging.basicConfig(
             level=logging.INFO,
@@ -20,28 +61,49 @@ def setup_logging(enable_logging=True):
         logging.disable(logging.CRITICAL)
 
 
-def log_message(message):
-    """Log a message with timestamp"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    print(f"[{timestamp}] {message}")
-    logging.info(message)
-
-
-def format_currency(amount):
-    """Format amount as currency"""
-    return f"${amount:.2f}"
+def log_message(message, level=logging.INFO):
+    """Log a message; the handler set up by setup_logging adds the timestamp
+    
+    Messages below WARNING are dropped unless setup_logging enabled logging,
+    so warnings and errors still reach stderr when it was never called.
+    """
+    if level < logging.WARNING and not _LOG_ENABLED:
+        return
+    logging.log(level, "%s", message)
 
 
-def format_hours(hours):
-    """Format hours with 2 decimal places"""
-    return f"{hours:.2f}h"
+# Bound str.format methods rather than wrapper functions, so per-row calls in
+# reports go straight to C without an extra Python frame
+format_currency = '${:.2f}'.format  # Format amount as currency
+format_hours = '{:.2f}h'.format  # Format hours with 2 decimal places
 
 
 def parse_date(date_string):
     """Parse date string in various formats"""
-    formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y%m%d']
+    # Dispatch on the string's shape; strict YYYY-MM-DD goes to fromisoformat
+    if '-' in date_string:
+        if len(date_string) == 10 and date_string[4] == '-' and date_string[7] == '-':
+            try:
+                return date.fromisoformat(date_string)
+            except ValueError:
+                pass
+        patterns = _DASH_DATE_PATTERNS
+    elif '/' in date_string:
+        patterns = _SLASH_DATE_PATTERNS
+    else:
+        patterns = _COMPACT_DATE_PATTERNS
     
-    for fmt in formats:
+    for pattern, (year, month, day) in patterns:
+        match = pattern.fullmatch(date_string)
+        if match:
+            fields = match.groups()
+            try:
+                return date(int(fields[year]), int(fields[month]), int(fields[day]))
+            except ValueError:
+                continue
+    
+    # Fall back to strptime for anything the patterns above don't cover
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(date_string, fmt).date()
         except ValueError:
@@ -52,9 +114,29 @@ def parse_date(date_string):
 
 def parse_time(time_string):
     """Parse time string in various formats"""
-    formats = ['%H:%M:%S', '%H:%M', '%I:%M:%S %p', '%I:%M %p']
+    # Dispatch on the string's shape: a trailing AM/PM marks 12-hour input
+    if time_string[-1:] in ('M', 'm'):
+        match = _TIME_12H_RE.fullmatch(time_string)
+        if match:
+            hour, minute, second, meridiem = match.groups()
+            hour = int(hour)
+            if 1 <= hour <= 12:
+                hour = hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+                try:
+                    return time(hour, int(minute), int(second or 0))
+                except ValueError:
+                    pass
+    else:
+        match = _TIME_24H_RE.fullmatch(time_string)
+        if match:
+            hour, minute, second = match.groups()
+            try:
+                return time(int(hour), int(minute), int(second or 0))
+            except ValueError:
+                pass
     
-    for fmt in formats:
+    # Fall back to strptime for anything the patterns above don't cover
+    for fmt in _TIME_FORMATS:
         try:
             return datetime.strptime(time_string, fmt).time()
         except ValueError:
@@ -65,14 +147,8 @@ def parse_time(time_string):
 
 def get_date_range(start_date, end_date):
     """Generate list of dates between start and end dates"""
-    current_date = start_date
-    dates = []
-    
-    while current_date <= end_date:
-        dates.append(current_date)
-        current_date += timedelta(days=1)
-    
-    return dates
+    num_days = (end_date - start_date).days + 1
+    return [start_date + timedelta(days=offset) for offset in range(num_days)]
 
 
 def validate_employee_id(employee_id):
@@ -80,19 +156,16 @@ def validate_employee_id(employee_id):
     if not employee_id:
         return False
     
-    # Simple validation - should start with EMP and have 3 digits
-    if employee_id.startswith('EMP') and len(employee_id) == 6:
-        try:
-            int(employee_id[3:])  # Check if last 3 characters are digits
-            return True
-        except ValueError:
-            pass
-    
-    return False
+    return _EMPLOYEE_ID_RE.fullmatch(employee_id) is not None
 
 
 def safe_float(value, default=0.0):
     """Safely convert value to float"""
+    # Exact type checks skip the conversion call for values already numeric
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
     try:
         return float(value)
     except (ValueError, TypeError):
@@ -101,6 +174,8 @@ def safe_float(value, default=0.0):
 
 def safe_int(value, default=0):
     """Safely convert value to int"""
+    if type(value) is int:
+        return value
     try:
         return int(value)
     except (ValueError, TypeError):
@@ -110,35 +185,96 @@ def safe_int(value, default=0):
 def load_json_file(file_path):
     """Load JSON data from file"""
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        # Parsed with the json module rather than orjson: it keeps integers
+        # wider than 64 bits exact and accepts the NaN/Infinity literals that
+        # older versions of save_json_file wrote
+        with open(file_path, 'rb') as f:
+            return json.loads(f.read())
     except Exception as e:
-        log_message(f"Error loading JSON file {file_path}: {e}")
+        log_message(f"Error loading JSON file {file_path}: {e}", logging.ERROR)
         return None
 
 
-def save_json_file(data, file_path):
-    """Save data to JSON file"""
+def _json_compatible(value):
+    """Return value with NaN/infinite floats as None and date/time keys as ISO strings
+    
+    This makes the stdlib json output match orjson's for the same data.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {(key.isoformat() if isinstance(key, (date, time)) else key): _json_compatible(item)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_compatible(item) for item in value]
+    return value
+
+
+def _dump_json_bytes(data, pretty=False):
+    """Serialize data to JSON bytes, using orjson when available
+    
+    Output is compact unless pretty is set, which indents by two spaces.
+    NaN and infinite floats are written as null on both paths.
+    """
+    if orjson is not None:
+        # Datetimes go through default=str like the stdlib path does
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=str, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which the stdlib handles
+            pass
+    data = _json_compatible(data)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False,
+                      default=str).encode('utf-8')
+
+
+def save_json_file(data, file_path, pretty=False):
+    """Save data to JSON file; pass pretty=True for indented, human-readable output"""
     try:
         # Ensure directory exists
         directory = os.path.dirname(file_path)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
         
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        _write_json_file(data, file_path, pretty)
         return True
     except Exception as e:
-        log_message(f"Error saving JSON file {file_path}: {e}")
+        log_message(f"Error saving JSON file {file_path}: {e}", logging.ERROR)
         return False
 
 
-def generate_report_filename(report_type, restaurant_name=None):
-    """Generate standardized report filename"""
-    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+def _write_json_file(data, file_path, pretty=False):
+    """Serialize data and write it in one buffered call; the directory must exist"""
+    payload = _dump_json_bytes(data, pretty)
+    with open(file_path, 'wb', buffering=1 << 20) as f:
+        f.write(payload)
+
+
+_REPORT_TIMESTAMP_FORMAT = '%Y-%m-%d_%H-%M-%S'
+_REPORT_NAME_TRANSLATION = str.maketrans({' ': '-', '&': 'and'})
+
+
+def report_timestamp(now=None):
+    """Format a report filename timestamp; compute once to share across a batch"""
+    return (now or datetime.now()).strftime(_REPORT_TIMESTAMP_FORMAT)
+
+
+def generate_report_filename(report_type, restaurant_name=None, timestamp=None):
+    """Generate standardized report filename
+    
+    Pass a timestamp from report_timestamp() to give every report in a
+    batch the same stamp; the current time is used otherwise.
+    """
+    if timestamp is None:
+        timestamp = report_timestamp()
     
     if restaurant_name:
-        clean_name = restaurant_name.lower().replace(' ', '-').replace('&', 'and')
+        clean_name = restaurant_name.lower().translate(_REPORT_NAME_TRANSLATION)
         return f"{clean_name}-{report_type}-{timestamp}.json"
     else:
         return f"{report_type}-{timestamp}.json"
@@ -146,46 +282,96 @@ def generate_report_filename(report_type, restaurant_name=None):
 
 def calculate_percentage(part, total):
     """Calculate percentage with safe division"""
-    if total == 0:
-        return 0.0
-    return round((part / total) * 100, 2)
+    return round((part / total) * 100, 2) if total else 0.0
+
+
+_BUSINESS_HOURS = {
+    'open_time': '09:00',
+    'close_time': '23:00',
+    'timezone': 'Australia/Melbourne'
+}
+_OPEN_TIME = time.fromisoformat(_BUSINESS_HOURS['open_time'])
+_CLOSE_TIME = time.fromisoformat(_BUSINESS_HOURS['close_time'])
 
 
 def get_business_hours():
     """Get standard business hours"""
-    return {
-        'open_time': '09:00',
-        'close_time': '23:00',
-        'timezone': 'Australia/Melbourne'
-    }
+    return dict(_BUSINESS_HOURS)
 
 
 def is_business_hours(check_time):
     """Check if time is within business hours"""
-    business_hours = get_business_hours()
-    open_time = datetime.strptime(business_hours['open_time'], '%H:%M').time()
-    close_time = datetime.strptime(business_hours['close_time'], '%H:%M').time()
-    
-    return open_time <= check_time <= close_time
+    return _OPEN_TIME <= check_time <= _CLOSE_TIME
+
+
+_POS_REQUIRED_FIELDS = ('sale_date', 'sale_time', 'item_name', 'quantity', 'unit_price')
+_ROSTER_REQUIRED_FIELDS = ('employee_id', 'employee_name', 'shift_date', 'start_time', 'end_time')
+
+
+def _required_field_checks(fields):
+    """Pair each required field with its error message, formatted once at import"""
+    return tuple((field, f"Missing required field: {field}") for field in fields)
+
+
+_POS_REQUIRED_CHECKS = _required_field_checks(_POS_REQUIRED_FIELDS)
+_ROSTER_REQUIRED_CHECKS = _required_field_checks(_ROSTER_REQUIRED_FIELDS)
+
+
+def _coerce_field(record, field, parser):
+    """Parse a string field in place, leaving it unchanged if it can't be parsed"""
+    value = record.get(field)
+    if isinstance(value, str):
+        try:
+            record[field] = parser(value)
+        except ValueError:
+            # Left as a string so validation reports the field's type error
+            pass
 
 
 class DataValidator:
-    """Data validation utilities"""
+    """Data validation utilities
+    
+    The validators expect native date/time values; run string input through
+    coerce_pos_record / coerce_roster_record first so it is parsed once.
+    """
+    
+    @staticmethod
+    def coerce_pos_record(record):
+        """Return a copy of a POS record with string dates and times parsed"""
+        coerced = dict(record)
+        _coerce_field(coerced, 'sale_date', parse_date)
+        _coerce_field(coerced, 'sale_time', parse_time)
+        return coerced
+    
+    @staticmethod
+    def coerce_roster_record(record):
+        """Return a copy of a roster record with string dates and times parsed"""
+        coerced = dict(record)
+        _coerce_field(coerced, 'shift_date', parse_date)
+        _coerce_field(coerced, 'start_time', parse_time)
+        _coerce_field(coerced, 'end_time', parse_time)
+        return coerced
     
     @staticmethod
     def validate_pos_record(record):
         """Validate POS record structure"""
-        required_fields = ['sale_date', 'sale_time', 'item_name', 'quantity', 'unit_price']
-        errors = []
+        errors = [message for field, message in _POS_REQUIRED_CHECKS
+                  if record.get(field) is None]
         
-        for field in required_fields:
-            if field not in record or record[field] is None:
-                errors.append(f"Missing required field: {field}")
+        sale_date = record.get('sale_date')
+        if sale_date is not None and not isinstance(sale_date, date):
+            errors.append("Sale date must be a date")
         
-        if 'quantity' in record and record['quantity'] <= 0:
+        sale_time = record.get('sale_time')
+        if sale_time is not None and not isinstance(sale_time, time):
+            errors.append("Sale time must be a time")
+        
+        quantity = record.get('quantity')
+        if quantity is not None and quantity <= 0:
             errors.append("Quantity must be positive")
         
-        if 'unit_price' in record and record['unit_price'] < 0:
+        unit_price = record.get('unit_price')
+        if unit_price is not None and unit_price < 0:
             errors.append("Unit price cannot be negative")
         
         return errors
@@ -193,17 +379,24 @@ class DataValidator:
     @staticmethod
     def validate_roster_record(record):
         """Validate roster record structure"""
-        required_fields = ['employee_id', 'employee_name', 'shift_date', 'start_time', 'end_time']
-        errors = []
+        errors = [message for field, message in _ROSTER_REQUIRED_CHECKS
+                  if record.get(field) is None]
+        
+        shift_date = record.get('shift_date')
+        if shift_date is not None and not isinstance(shift_date, date):
+            errors.append("Shift date must be a date")
         
-        for field in required_fields:
-            if field not in record or record[field] is None:
-                errors.append(f"Missing required field: {field}")
+        for field, label in (('start_time', 'Start time'), ('end_time', 'End time')):
+            value = record.get(field)
+            if value is not None and not isinstance(value, time):
+                errors.append(f"{label} must be a time")
         
-        if 'worked_hours' in record and record['worked_hours'] < 0:
+        worked_hours = record.get('worked_hours')
+        if worked_hours is not None and worked_hours < 0:
             errors.append("Worked hours cannot be negative")
         
-        if 'hourly_rate' in record and record['hourly_rate'] < 0:
+        hourly_rate = record.get('hourly_rate')
+        if hourly_rate is not None and hourly_rate < 0:
             errors.append("Hourly rate cannot be negative")
         
         return errors
@@ -263,8 +456,21 @@ def create_sample_data_files(output_dir):
         }
     ]
     
-    # Save sample files
-    save_json_file(pos_data, os.path.join(output_dir, 'sample_pos_data.json'))
-    save_json_file(roster_data, os.path.join(output_dir, 'sample_roster_data.json'))
+    # Save sample files; output_dir was created above, so write them directly
+    for file_name, data in (('sample_pos_data.json', pos_data),
+                            ('sample_roster_data.json', roster_data)):
+        file_path = os.path.join(output_dir, file_name)
+        try:
+            _write_json_file(data, file_path, pretty=False)
+        except Exception as e:
+            log_message(f"Error saving JSON file {file_path}: {e}", logging.ERROR)
     
-    log_message(f"Created sample data files in {output_dir}")
\ No newline at end of file
+    log_message(f"Created sample data files in {output_dir}")
+
+
+# Warm up strptime at import: the first call imports _strptime and builds its
+# locale-dependent regex cache, which later calls (the parse_date/parse_time
+# fallbacks, worked-hours strings, --date) then reuse instead of paying for it
+# on a hot path.
+datetime.strptime('2000-01-01', '%Y-%m-%d')
+datetime.strptime('00:00:00', '%H:%M:%S')
@@ -3,32 +3,58 @@ Basic tests for Restaurant Dummy
 """
 
 import unittest
+import math
 import os
 import sys
 import tempfile
 import shutil
+import threading
 from datetime import datetime, date, time
+from unittest import mock
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import utils
 from database import Database
 from pos_data import POSManager
 from roster_data import RosterManager
-from utils import parse_date, parse_time, validate_employee_id, safe_float
+from utils import (parse_date, parse_time, validate_employee_id, safe_float, safe_int,
+                   get_date_range, is_business_hours, load_json_file, save_json_file,
+                   create_sample_data_files, generate_report_filename, report_timestamp,
+                   calculate_percentage, format_currency, format_hours, DataValidator)
 
 
-class TestDatabase(unittest.TestCase):
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.config = {
-            'path': os.path.join(self.temp_dir, 'test.db')
+class DatabaseTestCase(unittest.TestCase):
+    """Base class sharing one database per test class, emptied after each test"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.config = {
+            'database': {'path': os.path.join(cls.temp_dir, 'test.db')},
+            'restaurant': {'name': 'Test Restaurant'}
         }
-        self.db = Database(self.config)
-        self.db.setup_tables()
+        cls.db = Database(cls.config['database'])
+        cls.db.setup_tables()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.temp_dir)
     
     def tearDown(self):
-        shutil.rmtree(self.temp_dir)
+        # Database methods commit their own transactions, so clear the
+        # tables rather than rolling back
+        with self.db.get_connection() as conn:
+            conn.executescript("""
+                DELETE FROM pos_sales;
+                DELETE FROM roster_data;
+                DELETE FROM employees;
+            """)
+
+
+class TestDatabase(DatabaseTestCase):
     
     def test_table_creation(self):
         """Test that tables are created successfully"""
@@ -41,6 +67,16 @@ class TestDatabase(unittest.TestCase):
             for table in expected_tables:
                 self.assertIn(table, tables)
     
+    def test_summary_indexes(self):
+        """Test that the date indexes are used by the summary queries"""
+        with self.db.get_connection() as conn:
+            plan = conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT COUNT(*), SUM(total_amount) FROM pos_sales
+                WHERE sale_date BETWEEN ? AND ?
+            """, ('2024-01-01', '2024-01-07')).fetchall()
+        self.assertIn('idx_pos_sales_date_emp', ' '.join(row[-1] for row in plan))
+    
     def test_insert_pos_sale(self):
         """Test POS sale insertion"""
         sale_data = {
@@ -58,6 +94,80 @@ class TestDatabase(unittest.TestCase):
         self.assertIsNotNone(sale_id)
         self.assertGreater(sale_id, 0)
     
+    def test_insert_pos_sales_bulk(self):
+        """Test bulk POS sale insertion"""
+        sales = [
+            {
+                'sale_date': '2024-01-15',
+                'sale_time': f'12:{minute:02d}:00',
+                'item_name': 'Test Burger',
+                'quantity': 1,
+                'unit_price': 15.50,
+                'total_amount': 15.50
+            }
+            for minute in range(10)
+        ]
+        
+        inserted = self.db.insert_pos_sales_bulk(sales)
+        self.assertEqual(inserted, 10)
+        self.assertEqual(len(self.db.get_daily_sales('2024-01-15')), 10)
+        self.assertEqual(self.db.get_pos_top_items('2024-01-15'), [('Test Burger', 10)])
+    
+    def test_insert_pos_sales_bulk_large_batch(self):
+        """Test bulk insertion of a batch split into multi-row statements"""
+        sales = [
+            {
+                'sale_date': '2024-01-16',
+                'sale_time': '12:00:00',
+                'item_name': f'Item {i}',
+                'quantity': 1,
+                'unit_price': 1.00,
+                'total_amount': 1.00
+            }
+            for i in range(1234)
+        ]
+        
+        inserted = self.db.insert_pos_sales_bulk(sales)
+        self.assertEqual(inserted, 1234)
+        
+        daily_sales = self.db.get_daily_sales('2024-01-16')
+        self.assertEqual(len(daily_sales), 1234)
+        self.assertEqual({sale['item_name'] for sale in daily_sales},
+                         {f'Item {i}' for i in range(1234)})
+    
+    def test_connection_reused(self):
+        """Test that the same thread gets the same connection back"""
+        self.assertIs(self.db.get_connection(), self.db.get_connection())
+    
+    def test_close_after_use_from_other_threads(self):
+        """Test that close() handles connections opened by other threads"""
+        db = Database({'path': os.path.join(self.temp_dir, 'threaded.db')})
+        db.setup_tables()
+        errors = []
+        
+        def worker():
+            try:
+                db.get_daily_sales('2024-01-15')
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # A new thread's connection prunes those of the finished workers
+        last = threading.Thread(target=worker)
+        last.start()
+        last.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(set(db._connections), {threading.current_thread(), last})
+        
+        db.close()
+        self.assertEqual(db._connections, {})
+    
     def test_insert_roster_record(self):
         """Test roster record insertion"""
         roster_data = {
@@ -76,6 +186,21 @@ class TestDatabase(unittest.TestCase):
         self.assertIsNotNone(roster_id)
         self.assertGreater(roster_id, 0)
     
+    def test_insert_employee_updates_in_place(self):
+        """Test that re-inserting an employee updates it and keeps created_at"""
+        employee = {'employee_id': 'EMP001', 'name': 'Test Employee',
+                    'position': 'Server', 'hourly_rate': 22.50}
+        self.db.insert_employee(employee)
+        with self.db.get_connection() as conn:
+            conn.execute("UPDATE employees SET created_at = '2024-01-01 00:00:00'")
+        
+        self.db.insert_employee({**employee, 'hourly_rate': 24.00})
+        
+        with self.db.get_connection() as conn:
+            row = conn.execute("SELECT hourly_rate, created_at FROM employees").fetchone()
+        self.assertEqual(row['hourly_rate'], 24.00)
+        self.assertEqual(row['created_at'], '2024-01-01 00:00:00')
+    
     def test_sales_summary(self):
         """Test sales summary calculation"""
         # Insert test data
@@ -92,22 +217,41 @@ class TestDatabase(unittest.TestCase):
         summary = self.db.get_sales_summary(days=1)
         self.assertEqual(summary['total_transactions'], 1)
         self.assertEqual(summary['total_revenue'], 20.00)
+    
+    def test_combined_summary(self):
+        """Test that the combined summary matches the separate summaries"""
+        today = date.today().isoformat()
+        self.db.insert_pos_sales_bulk([{
+            'sale_date': today,
+            'sale_time': '12:30:00',
+            'item_name': 'Test Item',
+            'quantity': 2,
+            'unit_price': 10.00,
+            'total_amount': 20.00,
+            'employee_id': 'EMP001'
+        }])
+        self.db.insert_roster_records_bulk([{
+            'employee_id': 'EMP001',
+            'employee_name': 'Test Employee',
+            'shift_date': today,
+            'start_time': '09:00:00',
+            'end_time': '17:00:00',
+            'worked_hours': 8.0,
+            'hourly_rate': 25.00,
+            'total_cost': 200.00
+        }])
+        
+        combined = self.db.get_combined_summary(days=1)
+        self.assertEqual(combined['sales_summary']['total_revenue'], 20.0)
+        self.assertEqual(combined['roster_summary']['total_labor_cost'], 200.0)
+        self.assertEqual(combined['sales_summary'], self.db.get_sales_summary(days=1))
+        self.assertEqual(combined['roster_summary'], self.db.get_roster_summary(days=1))
 
 
-class TestPOSManager(unittest.TestCase):
+class TestPOSManager(DatabaseTestCase):
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.config = {
-            'database': {'path': os.path.join(self.temp_dir, 'test.db')},
-            'restaurant': {'name': 'Test Restaurant'}
-        }
-        self.db = Database(self.config['database'])
-        self.db.setup_tables()
         self.pos_manager = POSManager(self.db, self.config)
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir)
-    
     def test_menu_items_loaded(self):
         """Test that menu items are loaded"""
         self.assertGreater(len(self.pos_manager.menu_items), 0)
@@ -118,36 +262,70 @@ class TestPOSManager(unittest.TestCase):
         self.assertIn('category', first_item)
         self.assertIn('price', first_item)
     
-    def test_generate_transaction(self):
-        """Test transaction generation"""
+    def test_generate_batch(self):
+        """Test batch transaction generation"""
         test_date = date(2024, 1, 15)
-        transaction = self.pos_manager._generate_transaction(test_date)
+        transactions = self.pos_manager._generate_batch(test_date, 50)
         
-        self.assertEqual(transaction['sale_date'], test_date)
-        self.assertIn('sale_time', transaction)
-        self.assertIn('item_name', transaction)
-        self.assertGreater(transaction['quantity'], 0)
-        self.assertGreater(transaction['unit_price'], 0)
-        self.assertEqual(
-            transaction['total_amount'],
-            transaction['quantity'] * transaction['unit_price']
-        )
+        self.assertEqual(len(transactions), 50)
+        for transaction in transactions:
+            self.assertEqual(transaction['sale_date'], test_date.isoformat())
+            self.assertEqual(parse_time(transaction['sale_time']).isoformat(), transaction['sale_time'])
+            self.assertTrue(9 <= parse_time(transaction['sale_time']).hour <= 22)
+            self.assertGreater(transaction['unit_price'], 0)
+            self.assertIn(transaction['quantity'], (1, 2, 3))
+            self.assertEqual(
+                transaction['total_amount'],
+                transaction['quantity'] * transaction['unit_price']
+            )
+    
+    def test_process_date(self):
+        """Test that generated transactions are stored for the date"""
+        test_date = date(2024, 1, 15)
+        inserted = self.pos_manager.process_date(test_date)
+        
+        self.assertGreaterEqual(inserted, 80)
+        self.assertEqual(len(self.db.get_daily_sales(test_date)), inserted)
+    
+    def test_import_pos_data_skips_bad_rows(self):
+        """Test that one bad record doesn't lose the rest of the import"""
+        # The failed row is reported even though setup_logging was never called
+        with self.assertLogs(level='WARNING') as logs:
+            imported = self.pos_manager.import_pos_data([
+                {'sale_date': '2024-01-15', 'sale_time': '09:15:00', 'item_name': 'Latte',
+                 'quantity': 1, 'unit_price': 4.80},
+                {'sale_date': '2024-01-15', 'sale_time': '09:20:00', 'item_name': None,
+                 'quantity': 1, 'unit_price': 4.80},
+            ])
+        
+        self.assertEqual([log.levelname for log in logs.records], ['WARNING', 'ERROR'])
+        self.assertEqual(imported, 1)
+        self.assertEqual(len(self.db.get_daily_sales('2024-01-15')), 1)
+    
+    def test_get_daily_summary(self):
+        """Test daily summary aggregation"""
+        self.pos_manager.import_pos_data([
+            {'sale_date': '2024-01-15', 'sale_time': '09:15:00', 'item_name': 'Latte',
+             'quantity': 2, 'unit_price': 4.80},
+            {'sale_date': '2024-01-15', 'sale_time': '09:45:00', 'item_name': 'Burger Deluxe',
+             'quantity': 1, 'unit_price': 18.50},
+            {'sale_date': '2024-01-15', 'sale_time': '13:05:00', 'item_name': 'Latte',
+             'quantity': 1, 'unit_price': 4.80},
+        ])
+        
+        summary = self.pos_manager.get_daily_summary(date(2024, 1, 15))
+        self.assertEqual(summary['total_transactions'], 3)
+        self.assertEqual(summary['items_sold'], 4)
+        self.assertAlmostEqual(summary['total_revenue'], 32.90)
+        self.assertEqual(summary['top_items'][0], {'item': 'Latte', 'quantity': 3})
+        self.assertEqual(summary['hourly_breakdown']['9']['transactions'], 2)
+        self.assertAlmostEqual(summary['hourly_breakdown']['13']['revenue'], 4.80)
 
 
-class TestRosterManager(unittest.TestCase):
+class TestRosterManager(DatabaseTestCase):
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.config = {
-            'database': {'path': os.path.join(self.temp_dir, 'test.db')},
-            'restaurant': {'name': 'Test Restaurant'}
-        }
-        self.db = Database(self.config['database'])
-        self.db.setup_tables()
         self.roster_manager = RosterManager(self.db, self.config)
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir)
-    
     def test_employees_loaded(self):
         """Test that employees are loaded"""
         self.assertGreater(len(self.roster_manager.employees), 0)
@@ -159,6 +337,40 @@ class TestRosterManager(unittest.TestCase):
         self.assertIn('position', first_emp)
         self.assertIn('hourly_rate', first_emp)
     
+    def test_setup_employees(self):
+        """Test that all employees are written to the database"""
+        self.roster_manager.setup_employees()
+        
+        with self.db.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+        self.assertEqual(count, len(self.roster_manager.employees))
+    
+    def test_import_roster_data_skips_bad_rows(self):
+        """Test that one bad record doesn't lose the rest of the import"""
+        record = {'employee_id': 'EMP001', 'employee_name': 'Test Employee',
+                  'shift_date': '2024-01-15', 'start_time': '09:00:00', 'end_time': '17:00:00',
+                  'worked_hours': 8.0}
+        with self.assertLogs(level='WARNING') as logs:
+            imported = self.roster_manager.import_roster_data([record,
+                                                               {**record, 'employee_name': None}])
+        
+        self.assertEqual([log.levelname for log in logs.records], ['WARNING', 'ERROR'])
+        self.assertEqual(imported, 1)
+        self.assertEqual(len(self.db.get_daily_roster('2024-01-15')), 1)
+    
+    def test_generate_week_schedule(self):
+        """Test weekly schedule shape and per-day lookup"""
+        monday = date(2024, 1, 15)
+        schedule = self.roster_manager.generate_week_schedule(monday)
+        
+        self.assertEqual(len(schedule), len(self.roster_manager.employees))
+        self.assertTrue(all(len(row) == 7 for row in schedule))
+        
+        # Days of the same week are served from one cached schedule
+        wednesday = date(2024, 1, 17)
+        first = self.roster_manager._get_working_employees(wednesday)
+        self.assertEqual(self.roster_manager._get_working_employees(wednesday), first)
+    
     def test_calculate_worked_hours(self):
         """Test worked hours calculation"""
         start_time = time(9, 0, 0)
@@ -167,6 +379,22 @@ class TestRosterManager(unittest.TestCase):
         hours = self.roster_manager.calculate_worked_hours(start_time, end_time)
         self.assertEqual(hours, 8.5)
     
+    def test_calculate_worked_hours_bulk(self):
+        """Test bulk worked hours calculation matches the scalar version"""
+        hours = self.roster_manager.calculate_worked_hours_bulk(
+            [9 * 60, 9 * 60, 22 * 60],
+            [17 * 60 + 30, 17 * 60 + 30, 2 * 60],
+            [0, 30, 0]
+        )
+        self.assertEqual(hours, [8.5, 8.0, 4.0])
+        self.assertEqual(hours[2], self.roster_manager.calculate_worked_hours(time(22, 0), time(2, 0)))
+        self.assertEqual(self.roster_manager.calculate_worked_hours_bulk([600], [630], [45]), [0])
+    
+    def test_calculate_worked_hours_mixed_types(self):
+        """Test worked hours calculation with string and time inputs mixed"""
+        hours = self.roster_manager.calculate_worked_hours('09:00:00', time(17, 30, 0))
+        self.assertEqual(hours, 8.5)
+    
     def test_calculate_worked_hours_with_breaks(self):
         """Test worked hours calculation with meal breaks"""
         start_time = time(9, 0, 0)
@@ -178,17 +406,49 @@ class TestRosterManager(unittest.TestCase):
 
 
 class TestUtils(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+    
     def test_parse_date(self):
         """Test date parsing"""
         self.assertEqual(parse_date('2024-01-15'), date(2024, 1, 15))
         self.assertEqual(parse_date('15/01/2024'), date(2024, 1, 15))
         self.assertEqual(parse_date('01/15/2024'), date(2024, 1, 15))
+        self.assertEqual(parse_date('20240115'), date(2024, 1, 15))
+        self.assertEqual(parse_date('5/1/2024'), date(2024, 1, 5))
+        with self.assertRaises(ValueError):
+            parse_date('2024-13-45')
+        with self.assertRaises(ValueError):
+            parse_date('٢٠٢٤-٠١-١٥')  # Arabic-Indic digits
     
     def test_parse_time(self):
         """Test time parsing"""
         self.assertEqual(parse_time('14:30:00'), time(14, 30, 0))
         self.assertEqual(parse_time('14:30'), time(14, 30, 0))
         self.assertEqual(parse_time('2:30 PM'), time(14, 30, 0))
+        self.assertEqual(parse_time('12:05:10 am'), time(0, 5, 10))
+        self.assertEqual(parse_time('12:05 PM'), time(12, 5, 0))
+        with self.assertRaises(ValueError):
+            parse_time('25:00')
+        with self.assertRaises(ValueError):
+            parse_time('٠٩:٣٠')
+    
+    def test_get_date_range(self):
+        """Test inclusive date range generation"""
+        self.assertEqual(
+            get_date_range(date(2024, 2, 28), date(2024, 3, 1)),
+            [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)]
+        )
+        self.assertEqual(get_date_range(date(2024, 1, 15), date(2024, 1, 15)), [date(2024, 1, 15)])
+        self.assertEqual(get_date_range(date(2024, 1, 15), date(2024, 1, 14)), [])
+    
+    def test_is_business_hours(self):
+        """Test business hours bounds"""
+        self.assertTrue(is_business_hours(time(9, 0)))
+        self.assertTrue(is_business_hours(time(23, 0)))
+        self.assertFalse(is_business_hours(time(8, 59)))
+        self.assertFalse(is_business_hours(time(23, 0, 1)))
     
     def test_validate_employee_id(self):
         """Test employee ID validation"""
@@ -196,6 +456,8 @@ class TestUtils(unittest.TestCase):
         self.assertTrue(validate_employee_id('EMP999'))
         self.assertFalse(validate_employee_id('EMP1'))
         self.assertFalse(validate_employee_id('E001'))
+        self.assertFalse(validate_employee_id('EMP-01'))
+        self.assertFalse(validate_employee_id('EMP 01'))
         self.assertFalse(validate_employee_id(''))
         self.assertFalse(validate_employee_id(None))
     
@@ -205,6 +467,166 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(safe_float('invalid', 0.0), 0.0)
         self.assertEqual(safe_float(None, -1.0), -1.0)
         self.assertEqual(safe_float(25), 25.0)
+        self.assertIsInstance(safe_float(25), float)
+    
+    def test_safe_int(self):
+        """Test safe int conversion"""
+        self.assertEqual(safe_int('15'), 15)
+        self.assertEqual(safe_int(15), 15)
+        self.assertEqual(safe_int(15.9), 15)
+        self.assertEqual(safe_int('invalid', -1), -1)
+        self.assertEqual(safe_int(None, -1), -1)
+    
+    def test_generate_report_filename(self):
+        """Test report filename cleaning"""
+        filename = generate_report_filename('sales', 'Fish & Chips Bar')
+        self.assertTrue(filename.startswith('fish-and-chips-bar-sales-'))
+        self.assertTrue(filename.endswith('.json'))
+        self.assertTrue(generate_report_filename('roster').startswith('roster-'))
+        
+        timestamp = report_timestamp(datetime(2024, 1, 15, 9, 30, 0))
+        self.assertEqual(generate_report_filename('sales', timestamp=timestamp),
+                         'sales-2024-01-15_09-30-00.json')
+    
+    def test_format_helpers(self):
+        """Test currency and hours formatting"""
+        self.assertEqual(format_currency(18.5), '$18.50')
+        self.assertEqual(format_currency(3), '$3.00')
+        self.assertEqual(format_hours(7.456), '7.46h')
+    
+    def test_calculate_percentage(self):
+        """Test percentage calculation and rounding"""
+        self.assertEqual(calculate_percentage(1, 4), 25.0)
+        self.assertEqual(calculate_percentage(2, 3), 66.67)
+        self.assertEqual(calculate_percentage(5, 0), 0.0)
+    
+    def test_validate_pos_record(self):
+        """Test POS record validation"""
+        record = {'sale_date': '2024-01-15', 'sale_time': '12:30:00', 'item_name': 'Latte',
+                  'quantity': 1, 'unit_price': 4.80}
+        self.assertEqual(DataValidator.validate_pos_record(record),
+                         ['Sale date must be a date', 'Sale time must be a time'])
+        
+        record = DataValidator.coerce_pos_record(record)
+        self.assertEqual(record['sale_date'], date(2024, 1, 15))
+        self.assertEqual(record['sale_time'], time(12, 30))
+        self.assertEqual(DataValidator.validate_pos_record(record), [])
+        
+        errors = DataValidator.validate_pos_record({**record, 'item_name': None, 'quantity': None,
+                                                    'unit_price': -1})
+        self.assertEqual(errors, [
+            'Missing required field: item_name',
+            'Missing required field: quantity',
+            'Unit price cannot be negative'
+        ])
+    
+    def test_validate_roster_record(self):
+        """Test roster record validation"""
+        record = {'employee_id': 'EMP001', 'employee_name': 'Test Employee',
+                  'shift_date': '2024-01-15', 'start_time': '09:00:00', 'end_time': '5:00 PM'}
+        self.assertEqual(len(DataValidator.validate_roster_record(record)), 3)
+        
+        record = DataValidator.coerce_roster_record(record)
+        self.assertEqual(record['end_time'], time(17, 0))
+        self.assertEqual(DataValidator.validate_roster_record(record), [])
+        
+        errors = DataValidator.validate_roster_record({'employee_id': 'EMP001', 'worked_hours': -1})
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(errors[-1], 'Worked hours cannot be negative')
+    
+    def test_coerce_record_keeps_unparseable_values(self):
+        """Test that malformed dates and times are left for validation to report"""
+        record = DataValidator.coerce_pos_record({'sale_date': 'not a date', 'sale_time': '25:99',
+                                                  'item_name': 'Latte', 'quantity': 1,
+                                                  'unit_price': 4.80})
+        self.assertEqual(record['sale_date'], 'not a date')
+        self.assertEqual(DataValidator.validate_pos_record(record),
+                         ['Sale date must be a date', 'Sale time must be a time'])
+        
+        record = DataValidator.coerce_roster_record({'employee_id': 'EMP001',
+                                                     'employee_name': 'Test Employee',
+                                                     'shift_date': '2024-01-15',
+                                                     'start_time': '9am-ish', 'end_time': '17:00'})
+        self.assertEqual(record['shift_date'], date(2024, 1, 15))
+        self.assertEqual(DataValidator.validate_roster_record(record),
+                         ['Start time must be a time'])
+    
+    def test_save_and_load_json_file(self):
+        """Test JSON round trip through save_json_file and load_json_file"""
+        file_path = os.path.join(self.temp_dir, 'nested', 'data.json')
+        data = {'date': date(2024, 1, 15), 'hours': {9: 2}, 'items': ['Latte', 'Café']}
+        
+        self.assertTrue(save_json_file(data, file_path))
+        self.assertEqual(
+            load_json_file(file_path),
+            {'date': '2024-01-15', 'hours': {'9': 2}, 'items': ['Latte', 'Café']}
+        )
+    
+    def test_create_sample_data_files(self):
+        """Test that both sample data files are written"""
+        output_dir = os.path.join(self.temp_dir, 'sample')
+        create_sample_data_files(output_dir)
+        
+        pos_data = load_json_file(os.path.join(output_dir, 'sample_pos_data.json'))
+        roster_data = load_json_file(os.path.join(output_dir, 'sample_roster_data.json'))
+        self.assertEqual(len(pos_data), 2)
+        self.assertEqual(roster_data[0]['employee_id'], 'EMP001')
+    
+    def test_save_json_file_pretty(self):
+        """Test compact and indented JSON output"""
+        file_path = os.path.join(self.temp_dir, 'data.json')
+        
+        save_json_file({'a': [1, 2]}, file_path)
+        with open(file_path) as f:
+            self.assertEqual(f.read(), '{"a":[1,2]}')
+        
+        save_json_file({'a': [1, 2]}, file_path, pretty=True)
+        with open(file_path) as f:
+            self.assertEqual(f.read(), '{\n  "a": [\n    1,\n    2\n  ]\n}')
+    
+    def test_json_output_without_orjson(self):
+        """Test that the stdlib fallback writes the same JSON as orjson"""
+        data = {'item': 'Café', 'total': float('nan'), 'hours': {9: 2},
+                'days': {date(2024, 1, 15): 1}, 'opened': time(9, 0)}
+        expected = ('{"item":"Café","total":null,"hours":{"9":2},'
+                    '"days":{"2024-01-15":1},"opened":"09:00:00"}').encode('utf-8')
+        
+        with mock.patch.object(utils, 'orjson', None):
+            self.assertEqual(utils._dump_json_bytes(data), expected)
+            fallback_pretty = utils._dump_json_bytes(data, pretty=True)
+        
+        if utils.orjson is not None:
+            self.assertEqual(utils._dump_json_bytes(data), expected)
+            self.assertEqual(utils._dump_json_bytes(data, pretty=True), fallback_pretty)
+    
+    def test_save_json_file_large_integer(self):
+        """Test that integers wider than 64 bits are saved and loaded exactly"""
+        file_path = os.path.join(self.temp_dir, 'data.json')
+        self.assertTrue(save_json_file({'id': 2 ** 70}, file_path))
+        with open(file_path) as f:
+            self.assertEqual(f.read(), '{"id":%d}' % 2 ** 70)
+        self.assertEqual(load_json_file(file_path), {'id': 2 ** 70})
+    
+    def test_load_json_file_nan(self):
+        """Test loading a file with the NaN literal older versions wrote"""
+        file_path = os.path.join(self.temp_dir, 'data.json')
+        with open(file_path, 'w') as f:
+            f.write('[{"employee_id": "EMP001", "worked_hours": NaN}]')
+        
+        data = load_json_file(file_path)
+        self.assertEqual(data[0]['employee_id'], 'EMP001')
+        self.assertTrue(math.isnan(data[0]['worked_hours']))
+    
+    def test_load_json_file_reloads_changed_file(self):
+        """Test that load_json_file returns fresh objects and picks up file changes"""
+        file_path = os.path.join(self.temp_dir, 'data.json')
+        save_json_file({'version': 1}, file_path)
+        first = load_json_file(file_path)
+        first['version'] = 99
+        self.assertEqual(load_json_file(file_path), {'version': 1})
+        
+        save_json_file({'version': 22}, file_path)
+        self.assertEqual(load_json_file(file_path), {'version': 22})
 
 
 if __name__ == '__main__':